@@ -1,100 +1,333 @@
-import requests
-from bs4 import BeautifulSoup
-import PyRSS2Gen
+import asyncio
+import aiohttp
+from bs4 import BeautifulSoup, SoupStrainer
 import datetime
-import time
+import hashlib
+import json
 import os
+import re
+import time
+import xml.etree.ElementTree as ET
+from email.utils import format_datetime
+
+# Prefer the C-backed lxml parser when it is installed; fall back to the
+# pure-Python parser so the script still runs without it
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+# selectolax builds the DOM directly in C (Lexbor), skipping per-node Python
+# object construction entirely; use it when installed, otherwise BeautifulSoup
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+# Browser-like headers shared by every scrape request. aiohttp advertises
+# Accept-Encoding itself (gzip/deflate, plus br when brotli is installed)
+# and decompresses transparently.
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept-Language': 'en-US,en;q=0.9',
+}
+
+# Per-URL HTTP validators so unchanged pages come back as cheap 304s
+HTTP_CACHE_FILE = 'http_validators.json'
+
+def _load_http_cache():
+    if os.path.exists(HTTP_CACHE_FILE):
+        with open(HTTP_CACHE_FILE, 'r', encoding='utf-8') as file:
+            try:
+                return json.load(file)
+            except json.JSONDecodeError:
+                pass
+    return {}
+
+_HTTP_CACHE = _load_http_cache()
+
+def _save_http_cache():
+    with open(HTTP_CACHE_FILE, 'w', encoding='utf-8') as file:
+        json.dump(_HTTP_CACHE, file)
+
+# Bound how many sources are fetched at the same time
+SCRAPE_CONCURRENCY = 8
+
+# Bound concurrent Telegram posts to stay well inside bot rate limits
+TELEGRAM_CONCURRENCY = 5
+
+# Telegram rejects message texts longer than this
+TELEGRAM_MESSAGE_LIMIT = 4096
+
+# MarkdownV2 special characters, escaped in a single C-level translate pass
+_MD_SPECIALS = str.maketrans({c: '\\' + c for c in r'_*[]()~`>#+-=|{}.!'})
+
+def _batch_messages(messages, limit=TELEGRAM_MESSAGE_LIMIT):
+    """Coalesce messages into the fewest texts that fit Telegram's length cap."""
+    batches = []
+    current = ''
+    for message in messages:
+        candidate = message if not current else current + '\n\n' + message
+        if len(candidate) > limit and current:
+            batches.append(current)
+            current = message
+        else:
+            current = candidate
+    if current:
+        batches.append(current)
+    return batches
+
+# Near-duplicate suppression: the same story often reappears with a reworded
+# link or across sources, so dedup on a normalized title fingerprint too.
+# Lives for the process lifetime, alongside the on-disk link dedup.
+_NORM_RE = re.compile(r'[^a-z0-9 ]+')
+TITLE_SEEN = set()
+
+def _title_fingerprint(title):
+    """Short stable hash of the lowercased, punctuation-stripped title."""
+    normalized = ' '.join(_NORM_RE.sub('', title.lower()).split())
+    return hashlib.blake2b(normalized.encode('utf-8'), digest_size=8).digest()
+
+# SoupStrainer objects memoized per selector so the fallback parser only
+# builds nodes for the target subtree instead of the whole page
+_STRAINERS = {}
+
+def _strainer_for(selector):
+    """SoupStrainer for simple 'tag.class' selectors; None when not expressible."""
+    if selector not in _STRAINERS:
+        tag, _, class_name = selector.partition('.')
+        if class_name and '.' not in class_name and ' ' not in tag:
+            _STRAINERS[selector] = SoupStrainer(tag, class_=class_name)
+        else:
+            _STRAINERS[selector] = None
+    return _STRAINERS[selector]
+
+def _parse_articles(content, selector):
+    """Parse HTML content and select the article nodes for a source."""
+    if LexborHTMLParser is not None:
+        return LexborHTMLParser(content).css(selector)
+    soup = BeautifulSoup(content, HTML_PARSER, parse_only=_strainer_for(selector))
+    return soup.select(selector)
 
 # Function to scrape news from a specified URL
-def scrape_news(url, selector):
+async def scrape_news(session, url, selector):
+    headers = dict(HEADERS)
+    validators = _HTTP_CACHE.get(url, {})
+    if validators.get('etag'):
+        headers['If-None-Match'] = validators['etag']
+    if validators.get('last_modified'):
+        headers['If-Modified-Since'] = validators['last_modified']
+
     try:
-        response = requests.get(url)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
+        async with session.get(url, headers=headers) as response:
+            if response.status == 304:
+                print(f"No changes for {url} (HTTP 304); skipping parse.")
+                return []
+            response.raise_for_status()
+
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            if etag or last_modified:
+                _HTTP_CACHE[url] = {'etag': etag, 'last_modified': last_modified}
+                _save_http_cache()
+
+            content = await response.read()
 
         # Use the provided selector to find articles
-        articles = soup.select(selector)
+        articles = _parse_articles(content, selector)
         items = []
 
+        # One timestamp per page; all articles in a scrape share it anyway
+        now = datetime.datetime.now()
+
         for article in articles:
-            title_tag = article.find('a')
-            title = title_tag.text.strip() if title_tag else 'No title'
-            link = title_tag['href'] if title_tag and title_tag.has_attr('href') else '#'
-            description_tag = article.find('p')
-            description = description_tag.text.strip() if description_tag else title
+            if LexborHTMLParser is not None:
+                title_tag = article.css_first('a')
+                title = title_tag.text(strip=True) if title_tag else 'No title'
+                link = (title_tag.attributes.get('href') or '#') if title_tag else '#'
+                description_tag = article.css_first('p')
+                description = description_tag.text(strip=True) if description_tag else title
+            else:
+                title_tag = article.find('a')
+                title = title_tag.text.strip() if title_tag else 'No title'
+                link = title_tag['href'] if title_tag and title_tag.has_attr('href') else '#'
+                description_tag = article.find('p')
+                description = description_tag.text.strip() if description_tag else title
 
             items.append({
                 'title': title,
                 'link': link,
                 'description': description,
-                'pubDate': datetime.datetime.now()
+                'pubDate': now
             })
 
         return items
 
-    except requests.exceptions.RequestException as e:
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
         print(f"Error fetching data from {url}: {e}")
         return []
 
-# Function to create the RSS feed
+# Function to create the RSS feed. ElementTree's C accelerator serializes the
+# small channel directly, which let PyRSS2Gen be dropped from requirements.
 def create_rss_feed(items, output_file, feed_title, feed_link, feed_description):
-    rss_items = []
+    rss = ET.Element('rss', version='2.0')
+    channel = ET.SubElement(rss, 'channel')
+    ET.SubElement(channel, 'title').text = feed_title
+    ET.SubElement(channel, 'link').text = feed_link
+    ET.SubElement(channel, 'description').text = feed_description
+    ET.SubElement(channel, 'lastBuildDate').text = format_datetime(datetime.datetime.now())
 
     for item in items:
-        rss_item = PyRSS2Gen.RSSItem(
-            title=item['title'],
-            link=item['link'],
-            description=item['description'],
-            guid=item['link'],
-            pubDate=item['pubDate']
-        )
-        rss_items.append(rss_item)
-
-    rss = PyRSS2Gen.RSS2(
-        title=feed_title,
-        link=feed_link,
-        description=feed_description,
-        lastBuildDate=datetime.datetime.now(),
-        items=rss_items
-    )
-
-    # Write the RSS feed to the file with UTF-8 encoding
-    with open(output_file, 'w', encoding='utf-8') as file:
-        rss.write_xml(file)
+        rss_item = ET.SubElement(channel, 'item')
+        ET.SubElement(rss_item, 'title').text = item['title']
+        ET.SubElement(rss_item, 'link').text = item['link']
+        ET.SubElement(rss_item, 'description').text = item['description']
+        ET.SubElement(rss_item, 'guid').text = item['link']
+        ET.SubElement(rss_item, 'pubDate').text = format_datetime(item['pubDate'])
+
+    ET.ElementTree(rss).write(output_file, encoding='utf-8', xml_declaration=True)
+
+class RateLimiter:
+    """Pace Telegram sends to a fixed interval across all concurrent tasks."""
+
+    def __init__(self, interval):
+        self.interval = interval
+        self._lock = asyncio.Lock()
+        self._next_allowed = 0.0
+
+    async def wait(self):
+        """Sleep until the next send slot, claiming it for this caller."""
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next_allowed - now
+            self._next_allowed = max(now, self._next_allowed) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def hold(self, seconds):
+        """Push the next slot out, e.g. after a 429 with Retry-After."""
+        self._next_allowed = max(self._next_allowed, time.monotonic() + seconds)
+
+# One message a second stays well inside the bot API's limits
+TELEGRAM_LIMITER = RateLimiter(1.0)
 
 # Function to send messages to Telegram
-def send_to_telegram(bot_token, chat_id, message):
+async def send_to_telegram(session, bot_token, chat_id, message):
     telegram_api_url = f'https://api.telegram.org/bot{bot_token}/sendMessage'
     payload = {
         'chat_id': chat_id,
         'text': message,
-        'parse_mode': 'Markdown'
+        'parse_mode': 'MarkdownV2'
     }
-    try:
-        response = requests.post(telegram_api_url, data=payload)
-        response.raise_for_status()  # Check for request errors
-    except requests.exceptions.HTTPError as http_err:
-        if response.status_code == 429:
-            print("Rate limit exceeded. Waiting before retrying...")
-            time.sleep(60)  # Wait for 60 seconds before retrying
-        else:
-            print(f"HTTP error occurred: {http_err}")
-    except requests.exceptions.RequestException as e:
-        print(f"Failed to send message to Telegram: {e}")
+    # Retry with backoff instead of dropping the message on a 429
+    for attempt in range(5):
+        await TELEGRAM_LIMITER.wait()
+        try:
+            async with session.post(telegram_api_url, data=payload) as response:
+                if response.status == 429:
+                    retry_after = int(response.headers.get('Retry-After', 2 ** attempt))
+                    print(f"Rate limit exceeded. Backing off for {retry_after}s.")
+                    TELEGRAM_LIMITER.hold(retry_after)
+                    continue
+                response.raise_for_status()
+                return
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"Failed to send message to Telegram: {e}")
+            return
+    print("Giving up on Telegram message after repeated rate limiting.")
+
+# Sent-id sets cached per path for the process lifetime: the poll loop runs
+# every two minutes and this process is the only writer, so rereading the
+# file each cycle is wasted I/O
+_SENT_IDS_CACHE = {}
 
 # Function to read the last sent item IDs from a file
 def read_sent_ids(file_path):
+    ids = _SENT_IDS_CACHE.get(file_path)
+    if ids is not None:
+        return ids
     if os.path.exists(file_path):
         with open(file_path, 'r') as file:
-            return set(file.read().splitlines())
-    return set()
+            ids = set(file.read().splitlines())
+    else:
+        ids = set()
+    _SENT_IDS_CACHE[file_path] = ids
+    return ids
+
+# Keep the on-disk dedup state bounded: news pages only ever show recent
+# links, so ids older than the newest few thousand can never match again
+SENT_IDS_MAX = 10000
+SENT_IDS_KEEP = 5000
+
+def _compact_sent_ids(file_path):
+    with open(file_path, 'r') as file:
+        lines = file.read().splitlines()
+    if len(lines) <= SENT_IDS_MAX:
+        return
+    with open(file_path, 'w') as file:
+        file.write('\n'.join(lines[-SENT_IDS_KEEP:]) + '\n')
 
 # Function to write the sent item IDs to a file
 def write_sent_ids(file_path, ids):
     with open(file_path, 'a') as file:
         file.write('\n'.join(ids) + '\n')
+    _compact_sent_ids(file_path)
+    _SENT_IDS_CACHE.setdefault(file_path, set()).update(ids)
+
+async def process_source(session, semaphore, tg_semaphore, source, bot_token, chat_id):
+    # Unpack the source config once; the loop body below only touches locals
+    sent_ids_file = source['sent_ids_file']
+    output_file = source['output_file']
+
+    sent_ids = read_sent_ids(sent_ids_file)
+    async with semaphore:
+        items = await scrape_news(session, source['url'], source['selector'])
+
+    if items:
+        # Every item was stamped with now() during this cycle's scrape, so the
+        # old today-filter always passed; only the sent-ids check matters.
+        # One pass builds both the items to send and their id set.
+        new_items = []
+        new_ids = set()
+        for item in items:
+            link = item['link']
+            if link in sent_ids:
+                continue
+            fingerprint = _title_fingerprint(item['title'])
+            if fingerprint in TITLE_SEEN:
+                continue
+            TITLE_SEEN.add(fingerprint)
+            new_items.append(item)
+            new_ids.add(link)
+
+        if new_items:
+            create_rss_feed(
+                new_items,
+                output_file,
+                source['feed_title'],
+                source['feed_link'],
+                source['feed_description']
+            )
+            print(f"RSS feed created successfully: {output_file}")
 
-def main():
+            # One POST per batch of items instead of one per item; escape once
+            # so Telegram never rejects a batch over stray Markdown characters
+            messages = [
+                f"*{item['title'].translate(_MD_SPECIALS)}*\n\n{item['description'].translate(_MD_SPECIALS)}"
+                for item in new_items
+            ]
+
+            async def send(text):
+                async with tg_semaphore:
+                    await send_to_telegram(session, bot_token, chat_id, text)
+
+            await asyncio.gather(*(send(text) for text in _batch_messages(messages)))
+
+            # Update the list of sent item IDs
+            write_sent_ids(sent_ids_file, new_ids)
+
+async def main():
     sources = [
         {
             'url': "https://www.moneycontrol.com/news/business/stocks/",
@@ -133,35 +366,21 @@ def main():
         print("Telegram bot token or chat ID is missing.")
         return
 
-    while True:
-        for source in sources:
-            sent_ids = read_sent_ids(source['sent_ids_file'])
-            items = scrape_news(source['url'], source['selector'])
-            
-            if items:
-                today = datetime.datetime.now().date()
-                new_items = [item for item in items if item['pubDate'].date() == today and item['link'] not in sent_ids]
-                
-                if new_items:
-                    create_rss_feed(
-                        new_items,
-                        source['output_file'],
-                        source['feed_title'],
-                        source['feed_link'],
-                        source['feed_description']
-                    )
-                    print(f"RSS feed created successfully: {source['output_file']}")
-
-                    new_ids = set(item['link'] for item in new_items)
-                    for item in new_items:
-                        message = f"*{item['title']}*\n\n{item['description']}"
-                        send_to_telegram(bot_token, chat_id, message)
-
-                    # Update the list of sent item IDs
-                    write_sent_ids(source['sent_ids_file'], new_ids)
-                    
-        # Wait for 2 minutes before checking again
-        time.sleep(120)
+    semaphore = asyncio.Semaphore(SCRAPE_CONCURRENCY)
+    tg_semaphore = asyncio.Semaphore(TELEGRAM_CONCURRENCY)
+    connector = aiohttp.TCPConnector(limit=32, keepalive_timeout=60)
+    # Bound every request so one stalled site can't wedge the poll loop
+    timeout = aiohttp.ClientTimeout(total=15)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        while True:
+            # Fetch all sources concurrently instead of one after another
+            await asyncio.gather(*(
+                process_source(session, semaphore, tg_semaphore, source, bot_token, chat_id)
+                for source in sources
+            ))
+
+            # Wait for 2 minutes before checking again
+            await asyncio.sleep(120)
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
@@ -1,42 +1,147 @@
+import atexit
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
 import datetime
+import functools
 import time
 import os
-import json
+import orjson
 import logging
+import queue
 import random
 from dotenv import load_dotenv
-from logging.handlers import RotatingFileHandler
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
 from dateutil import parser
 
+from config import SOURCES
+
+# Prefer the C-backed lxml parser when it is installed; fall back to the
+# pure-Python parser so the script still runs without it
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+# selectolax builds the DOM directly in C (Lexbor), skipping per-node Python
+# object construction entirely; use it when installed, otherwise BeautifulSoup
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
 # Load environment variables from .env file
 load_dotenv()
 
-# Setup logging to log to both console and file with rotation
+# Setup logging to log to both console and file with rotation. The rotating
+# file handler sits behind a QueueListener so disk writes happen on a
+# background thread instead of the scrape path.
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 file_handler = RotatingFileHandler('scraper.log', maxBytes=10*1024*1024, backupCount=5)
 file_handler.setLevel(logging.INFO)
 file_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
-logging.getLogger().addHandler(file_handler)
+_log_queue = queue.Queue(-1)
+logging.getLogger().addHandler(QueueHandler(_log_queue))
+_log_listener = QueueListener(_log_queue, file_handler)
+_log_listener.start()
+# Drain queued records before interpreter shutdown; the listener thread is a
+# daemon, so without this the final log lines can be lost
+atexit.register(_log_listener.stop)
 
 # Get the directory of the current script to ensure JSON files are created in the same folder
 script_directory = os.path.dirname(os.path.abspath(__file__))
 
-def parse_date(date_str):
-    """Parse a date string into a datetime object."""
+# Shared sessions reuse pooled keep-alive connections instead of paying a
+# fresh TCP+TLS handshake per request. Telegram gets its own pool so alert
+# sends never queue behind scrape traffic.
+SESSION = requests.Session()
+SESSION.mount('https://', HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=32,
+    max_retries=Retry(total=3, backoff_factor=1)
+))
+TELEGRAM_SESSION = requests.Session()
+TELEGRAM_SESSION.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
+# Constant request headers, built once instead of per scrape call
+BASE_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'Connection': 'keep-alive'
+}
+
+# Per-URL HTTP validators so unchanged pages come back as cheap 304s
+HTTP_CACHE_FILE = os.path.join(script_directory, 'http_cache.json')
+
+def _load_http_cache():
+    if os.path.exists(HTTP_CACHE_FILE):
+        with open(HTTP_CACHE_FILE, 'rb') as file:
+            try:
+                return orjson.loads(file.read())
+            except orjson.JSONDecodeError:
+                logging.warning("Failed to decode JSON from %s. Starting a fresh cache.", HTTP_CACHE_FILE)
+    return {}
+
+_HTTP_CACHE = _load_http_cache()
+
+def _save_http_cache():
+    with open(HTTP_CACHE_FILE, 'wb') as file:
+        file.write(orjson.dumps(_HTTP_CACHE))
+
+# Known feed date formats, ordered by how often they show up; a matching
+# strptime is roughly 10x cheaper than the fuzzy dateutil fallback
+DATE_FORMATS = (
+    '%Y-%m-%dT%H:%M:%S%z',
+    '%Y-%m-%dT%H:%M:%SZ',
+    '%a, %d %b %Y %H:%M:%S %z',
+    '%b %d, %Y %H:%M',
+)
+
+@functools.lru_cache(maxsize=4096)
+def _parse_date_cached(date_str):
+    """Parse a date string, cached on the raw string since feeds repeat dates."""
+    cleaned = date_str.replace('Updated On :', '').strip()
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.datetime.strptime(cleaned, date_format)
+        except ValueError:
+            continue
     try:
-        date_str = date_str.replace('Updated On :', '').strip()
-        parsed_date = parser.parse(date_str, fuzzy=True)
-        logging.info(f"Parsed date: {parsed_date}")
+        parsed_date = parser.parse(cleaned, fuzzy=True)
+        logging.debug("Parsed date: %s", parsed_date)
         return parsed_date
     except ValueError as e:
-        logging.error(f"Date parsing error for date_str '{date_str}': {e}")
+        logging.error("Date parsing error for date_str '%s': %s", date_str, e)
+        return datetime.datetime.now()
+
+def parse_date(date_str):
+    """Parse a date string into a datetime object."""
+    # Fast path: don't pay for the fuzzy parser on empty/whitespace input
+    if not date_str or not date_str.strip():
         return datetime.datetime.now()
+    return _parse_date_cached(date_str)
+
+def _parse_articles(content, selector):
+    """Parse HTML content and select the article nodes for a source."""
+    if LexborHTMLParser is not None:
+        return LexborHTMLParser(content).css(selector)
+    soup = BeautifulSoup(content, HTML_PARSER)
+    return soup.select(selector)
 
 def extract_date(article):
     """Extract date from an article, handling both <span> and <time> tags."""
     date = None
+    if hasattr(article, 'css_first'):
+        date_span = article.css_first('span')
+        if date_span:
+            date = date_span.text(strip=True)
+        date_time = article.css_first('time')
+        if date_time:
+            date = date_time.attributes.get('datetime', None)
+        return date
     date_span = article.find('span')
     if date_span:
         date = date_span.get_text(strip=True)
@@ -47,29 +152,48 @@ def extract_date(article):
 
 def dynamic_extract(element, tag_names, attribute_name=None):
     """Dynamically extract content from an HTML element using a list of possible tags."""
+    is_lexbor = hasattr(element, 'css_first')
     for tag_name in tag_names:
-        target = element.find(tag_name)
-        if target:
-            if attribute_name and target.has_attr(attribute_name):
-                return target.get(attribute_name, '').strip()
-            return target.get_text(strip=True)
+        if is_lexbor:
+            target = element.css_first(tag_name)
+            if target:
+                if attribute_name:
+                    value = target.attributes.get(attribute_name)
+                    if value is not None:
+                        return value.strip()
+                else:
+                    return target.text(strip=True)
+        else:
+            target = element.find(tag_name)
+            if target:
+                if attribute_name and target.has_attr(attribute_name):
+                    return target.get(attribute_name, '').strip()
+                return target.get_text(strip=True)
     return ''
 
 def scrape_news(url, selector):
     """Scrape news articles from a given URL and selector."""
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-        'Accept-Language': 'en-US,en;q=0.9',
-        'Accept-Encoding': 'gzip, deflate, br',
-        'Connection': 'keep-alive'
-    }
+    headers = dict(BASE_HEADERS)
+    validators = _HTTP_CACHE.get(url, {})
+    if validators.get('etag'):
+        headers['If-None-Match'] = validators['etag']
+    if validators.get('last_modified'):
+        headers['If-Modified-Since'] = validators['last_modified']
 
     try:
-        response = requests.get(url, headers=headers)
+        response = SESSION.get(url, headers=headers)
+        if response.status_code == 304:
+            logging.info("No changes for %s (HTTP 304); skipping parse.", url)
+            return []
         response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
 
-        articles = soup.select(selector)
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if etag or last_modified:
+            _HTTP_CACHE[url] = {'etag': etag, 'last_modified': last_modified}
+            _save_http_cache()
+
+        articles = _parse_articles(response.content, selector)
         items = []
 
         for article in articles:
@@ -96,46 +220,81 @@ def scrape_news(url, selector):
         return items
 
     except requests.exceptions.RequestException as e:
-        logging.error(f"Error fetching data from {url}: {e}")
+        logging.error("Error fetching data from %s: %s", url, e)
         return []
 
-def create_or_update_json_feed(items, output_file):
-    """Create or update a JSON feed with current date items."""
+def _jsonl_path(output_file):
+    """Path of the append-only JSONL sidecar backing a feed file."""
+    return os.path.join(script_directory, os.path.splitext(output_file)[0] + '.jsonl')
+
+def append_jsonl_items(items, output_file):
+    """Append new items to the feed's JSONL sidecar — O(new) per source."""
+    with open(_jsonl_path(output_file), 'ab') as file:
+        for item in items:
+            file.write(orjson.dumps(item) + b'\n')
+
+def rebuild_json_feed(output_file):
+    """Rebuild the summary JSON feed from the sidecar, keeping today's items."""
     output_path = os.path.join(script_directory, output_file)
-    today = datetime.datetime.now().date()
+    jsonl_path = _jsonl_path(output_file)
+    if not os.path.exists(jsonl_path):
+        return
 
-    if os.path.exists(output_path):
-        with open(output_path, 'r', encoding='utf-8') as file:
+    today = datetime.datetime.now().date()
+    items = []
+    with open(jsonl_path, 'rb') as file:
+        for line in file:
+            if not line.strip():
+                continue
             try:
-                existing_data = json.load(file)
-                existing_items = existing_data.get('items', [])
-                # Keep only items from today
-                existing_items = [item for item in existing_items if datetime.datetime.fromisoformat(item['pubDate']).date() == today]
-            except json.JSONDecodeError:
-                logging.warning(f"Failed to decode JSON from {output_path}. Creating a new feed.")
-                existing_items = []
-    else:
-        existing_items = []
-
-    # Add new items from today
-    new_items = [item for item in items if datetime.datetime.fromisoformat(item['pubDate']).date() == today]
-    updated_items = existing_items + new_items
+                item = orjson.loads(line)
+            except orjson.JSONDecodeError:
+                logging.warning("Skipping malformed line in %s.", jsonl_path)
+                continue
+            if datetime.datetime.fromisoformat(item['pubDate']).date() == today:
+                items.append(item)
 
     feed_data = {
         'title': "RSS Feed Title",
         'link': "https://example.com",
         'description': "RSS Feed Description",
         'lastBuildDate': datetime.datetime.now().isoformat(),
-        'items': updated_items
+        'items': items
     }
 
     try:
-        logging.info(f"Creating/Updating JSON feed: {output_path} with {len(updated_items)} items.")
-        with open(output_path, 'w', encoding='utf-8') as file:
-            json.dump(feed_data, file, indent=4)
-            logging.info(f"JSON feed successfully written to {output_path}.")
+        logging.info("Rebuilding JSON feed: %s with %d items.", output_path, len(items))
+        with open(output_path, 'wb') as file:
+            file.write(orjson.dumps(feed_data, option=orjson.OPT_INDENT_2))
+            logging.info("JSON feed successfully written to %s.", output_path)
     except Exception as e:
-        logging.error(f"Failed to write JSON feed to {output_path}: {e}")
+        logging.error("Failed to write JSON feed to %s: %s", output_path, e)
+
+    # Compact the sidecar down to today's items so it doesn't grow unbounded
+    with open(jsonl_path, 'wb') as file:
+        for item in items:
+            file.write(orjson.dumps(item) + b'\n')
+
+class RateLimiter:
+    """Paced limiter that only sleeps when calls arrive faster than the allowed rate."""
+
+    def __init__(self, rate=1.0, per=1.0):
+        self.interval = per / rate
+        self._next_slot = time.monotonic()
+
+    def wait(self):
+        now = time.monotonic()
+        if now < self._next_slot:
+            time.sleep(self._next_slot - now)
+            now = time.monotonic()
+        self._next_slot = now + self.interval
+
+    def hold(self, seconds):
+        """Push the next slot out, e.g. after a 429 Retry-After."""
+        self._next_slot = time.monotonic() + seconds
+
+# Telegram allows ~1 msg/s per chat; pace sends instead of blind sleeps
+TELEGRAM_LIMITER = RateLimiter(rate=1.0, per=1.0)
 
 def send_to_telegram(bot_token, chat_id, message):
     telegram_api_url = f'https://api.telegram.org/bot{bot_token}/sendMessage'
@@ -144,56 +303,83 @@ def send_to_telegram(bot_token, chat_id, message):
         'text': message,
         'parse_mode': 'Markdown'
     }
+    TELEGRAM_LIMITER.wait()
     try:
-        response = requests.post(telegram_api_url, data=payload)
+        response = TELEGRAM_SESSION.post(telegram_api_url, data=payload)
         response.raise_for_status()
     except requests.exceptions.HTTPError as http_err:
         if response.status_code == 429:
-            logging.warning("Rate limit exceeded. Waiting before retrying...")
-            time.sleep(60)
+            retry_after = int(response.headers.get('Retry-After', 60))
+            logging.warning("Rate limit exceeded. Backing off for %ds...", retry_after)
+            TELEGRAM_LIMITER.hold(retry_after)
         else:
-            logging.error(f"HTTP error occurred: {http_err}")
+            logging.error("HTTP error occurred: %s", http_err)
     except requests.exceptions.RequestException as e:
-        logging.error(f"Failed to send message to Telegram: {e}")
+        logging.error("Failed to send message to Telegram: %s", e)
+
+# Sent-id sets keyed by file path, so each file is parsed at most once per run
+_SENT_IDS_CACHE = {}
 
 def read_sent_ids(file_path):
-    """Read the set of sent IDs from a file."""
+    """Read the set of sent IDs from a file, consulting the in-memory cache first."""
+    cached = _SENT_IDS_CACHE.get(file_path)
+    if cached is not None:
+        return cached
+    ids = set()
     if os.path.exists(file_path):
-        with open(file_path, 'r', encoding='utf-8') as file:
+        with open(file_path, 'rb') as file:
             try:
-                return set(json.load(file))
-            except json.JSONDecodeError:
-                logging.warning(f"Failed to decode JSON from {file_path}. Returning empty set.")
-                return set()
-    return set()
-
-def write_sent_ids(file_path, ids):
-    """Write a set of sent IDs to a file."""
-    with open(file_path, 'w', encoding='utf-8') as file:
-        json.dump(list(ids), file)
-
-def process_source(source, bot_token, chat_id):
+                ids = set(orjson.loads(file.read()))
+            except orjson.JSONDecodeError:
+                logging.warning("Failed to decode JSON from %s. Returning empty set.", file_path)
+    _SENT_IDS_CACHE[file_path] = ids
+    return ids
+
+def write_sent_ids(file_path, new_ids):
+    """Merge new IDs into the cached set and persist only when something was added."""
+    ids = _SENT_IDS_CACHE.setdefault(file_path, set())
+    to_add = new_ids - ids
+    if not to_add:
+        return
+    ids.update(to_add)
+    with open(file_path, 'wb') as file:
+        file.write(orjson.dumps(list(ids)))
+
+def process_source(source, bot_token, chat_id, seen_links):
     """Process a news source by scraping data, sending messages, and updating sent IDs."""
     sent_ids_file_path = os.path.join(script_directory, source['sent_ids_file'])
     sent_ids = read_sent_ids(sent_ids_file_path)
     items = scrape_news(source['url'], source['selector'])
-    
+
     if items:
         today = datetime.datetime.now().date()
         new_items = [item for item in items if datetime.datetime.fromisoformat(item['pubDate']).date() == today]
-        new_items_to_send = [item for item in new_items if item['link'] not in sent_ids]
+
+        # Overlapping sources surface the same story; send each link once per run
+        new_items_to_send = []
+        new_ids = set()
+        for item in new_items:
+            link = item['link']
+            if link in sent_ids or link in seen_links:
+                continue
+            seen_links.add(link)
+            new_ids.add(link)
+            new_items_to_send.append(item)
         
         if new_items_to_send:
             for item in new_items_to_send:
                 message = f"*{item['title']}*\n\n{item['description']}"
                 send_to_telegram(bot_token, chat_id, message)
 
-            create_or_update_json_feed(new_items_to_send, source['output_file'])
-            logging.info(f"JSON feed created/updated successfully: {source['output_file']}")
+            append_jsonl_items(new_items_to_send, source['output_file'])
+            logging.info("New items appended to feed sidecar: %s", source['output_file'])
+
+            write_sent_ids(sent_ids_file_path, new_ids)
+            logging.info("Sent alerts updated in %s", sent_ids_file_path)
+
+        return len(new_items_to_send)
 
-            new_ids = set(item['link'] for item in new_items_to_send)
-            write_sent_ids(sent_ids_file_path, sent_ids.union(new_ids))
-            logging.info(f"Sent alerts updated in {sent_ids_file_path}")
+    return 0
 
 def main():
     bot_token = os.environ.get('TELEGRAM_BOT_TOKEN')
@@ -203,62 +389,26 @@ def main():
         logging.error("Telegram bot token or chat ID is not set. Exiting.")
         return
 
-    sources = [
-        {
-            'url': "https://www.moneycontrol.com/news/business/stocks/",
-            'selector': 'li.clearfix',
-            'output_file': "moneycontrol_rss_feed.json",
-            'sent_ids_file': 'moneycontrol_sent_ids.json'
-        },
-         {
-            'url': "https://www.moneycontrol.com/news/business/companies/",
-            'selector': 'li.clearfix',
-            'output_file': "moneycontrol_companies_rss_feed.json",
-            'sent_ids_file': 'moneycontrol__companies_sent_ids.json'
-        },
-        {
-            'url': "https://economictimes.indiatimes.com/markets/stocks/earnings/news",
-            'selector': 'div.eachStory',
-            'output_file': "economictimes_earnings_rss_feed.json",
-            'sent_ids_file': 'economictimes_earnings_sent_ids.json'
-        },
-        {
-            'url': "https://economictimes.indiatimes.com/markets/stocks/news",
-            'selector': 'div.eachStory',
-            'output_file': "economictimes_stocks_rss_feed.json",
-            'sent_ids_file': 'economictimes_stocks_sent_ids.json'
-        },
-        {
-            'url': "https://www.business-standard.com/markets/news",
-            'selector': 'div.listingstyle_cardlistlist__dfq57.cardlist',
-            'output_file': "businessstandard_markets_news_rss_feed.json",
-            'sent_ids_file': 'businessstandard_markets_news_sent_ids.json'
-        },
-        {
-            'url': "https://www.business-standard.com/markets/capital-market-news",
-            'selector': 'div.listingstyle_cardlistlist__dfq57.cardlist',
-            'output_file': "businessstandard_capital_market_news_rss_feed.json",
-            'sent_ids_file': 'businessstandard_capital_market_news_sent_ids.json'
-        },
-        {
-            'url': "https://www.business-standard.com/topic/ipos",
-            'selector': 'div.listingstyle_cardlistlist__dfq57.cardlist',
-            'output_file': "businessstandard_ipos_rss_feed.json",
-            'sent_ids_file': 'businessstandard_ipos_sent_ids.json'
-        },
-        {
-            'url': "https://www.business-standard.com/markets/mutual-fund",
-            'selector': 'div.listingstyle_cardlistlist__dfq57.cardlist',
-            'output_file': "businessstandard_mutual_fund_rss_feed.json",
-            'sent_ids_file': 'businessstandard_mutual_fund_sent_ids.json'
-        }
-    ]
+    # Shared source list lives in config.py
+    sources = list(SOURCES)
 
     logging.info("Starting news scraping process...")
     random.shuffle(sources)
+
+    # Seed cross-source dedup with everything any source has already sent;
+    # otherwise a story one source recorded last run can re-alert from
+    # another source whose own sent-ids file never saw it
+    seen_links = set()
+    for source in sources:
+        seen_links.update(read_sent_ids(os.path.join(script_directory, source['sent_ids_file'])))
+    total_sent = 0
+    for source in sources:
+        total_sent += process_source(source, bot_token, chat_id, seen_links)
+
+    # Rebuild each summary feed once from its sidecar instead of per source
     for source in sources:
-        process_source(source, bot_token, chat_id)
-    logging.info("Scraping process completed.")
+        rebuild_json_feed(source['output_file'])
+    logging.info("Scraping process completed. %d new alerts sent.", total_sent)
 
 if __name__ == "__main__":
     main()
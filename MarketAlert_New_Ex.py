@@ -1,15 +1,40 @@
+import atexit
+import hashlib
+import signal
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, SoupStrainer
 import datetime
+import re
+import threading
 import time
 import os
-import json
+import orjson
 import logging
 import random
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 from logging.handlers import RotatingFileHandler
 from dateutil import parser
 
+from config import SOURCES
+
+# Prefer the C-backed lxml parser when it is installed; fall back to the
+# pure-Python parser so the script still runs without it
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+# selectolax builds the DOM directly in C (Lexbor), skipping per-node Python
+# object construction entirely; use it when installed, otherwise BeautifulSoup
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -23,10 +48,67 @@ logging.getLogger().addHandler(file_handler)
 # Get the directory of the current script to ensure JSON files are created in the same folder
 script_directory = os.path.dirname(os.path.abspath(__file__))
 
+# One pooled session for all HTTP traffic; keep-alive reuses sockets to the
+# same hosts every cycle instead of paying a fresh TCP+TLS handshake
+SESSION = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=32,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+)
+SESSION.mount('http://', _adapter)
+SESSION.mount('https://', _adapter)
+SESSION.headers.update({
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'Connection': 'keep-alive'
+})
+
+# Telegram gets its own small pool so alert sends keep one warm TLS
+# connection to api.telegram.org and never queue behind scrape traffic
+TELEGRAM_SESSION = requests.Session()
+TELEGRAM_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[500, 502, 503, 504])
+))
+
+# Per-URL HTTP validators so unchanged pages come back as cheap 304s with no
+# body to download or parse. Guarded by a lock: sources fetch on a thread pool.
+HTTP_CACHE_FILE = os.path.join(script_directory, 'http_cache_ex.json')
+_HTTP_CACHE_LOCK = threading.Lock()
+
+def _load_http_cache():
+    if os.path.exists(HTTP_CACHE_FILE):
+        with open(HTTP_CACHE_FILE, 'rb') as file:
+            try:
+                return orjson.loads(file.read())
+            except orjson.JSONDecodeError:
+                logging.warning(f"Failed to decode JSON from {HTTP_CACHE_FILE}. Starting a fresh cache.")
+    return {}
+
+_HTTP_CACHE = _load_http_cache()
+
+def _save_http_cache():
+    with open(HTTP_CACHE_FILE, 'wb') as file:
+        file.write(orjson.dumps(_HTTP_CACHE))
+
+# Keywords to exclude, compiled once into a single case-insensitive pattern
+# so each article needs one scan instead of one per keyword
+EXCLUDE_KEYWORDS = ["KR Choksey", "Lilladher", "motilal", "ICICI Securities", "Sharekhan", "straight session", "Anand Rathi", "Emkay"]
+EXCLUDE_RE = re.compile('|'.join(map(re.escape, EXCLUDE_KEYWORDS)), re.IGNORECASE)
+
 def parse_date(date_str):
     """Parse a date string into a datetime object."""
+    date_str = date_str.replace('Updated On :', '').strip()
+    # Fast path: ISO 8601 strings (our own isoformat() round-trips) parse in C,
+    # ~50x faster than the heuristic dateutil parser
+    try:
+        return datetime.datetime.fromisoformat(date_str)
+    except ValueError:
+        pass
     try:
-        date_str = date_str.replace('Updated On :', '').strip()
         parsed_date = parser.parse(date_str, fuzzy=True)
         logging.info(f"Parsed date: {parsed_date}")
         return parsed_date
@@ -34,9 +116,38 @@ def parse_date(date_str):
         logging.error(f"Date parsing error for date_str '{date_str}': {e}")
         return datetime.datetime.now()
 
+# SoupStrainer objects memoized per selector so the fallback parser only
+# builds nodes for the target subtree instead of the whole page
+_STRAINERS = {}
+
+def _strainer_for(selector):
+    """SoupStrainer for simple 'tag.class' selectors; None when not expressible."""
+    if selector not in _STRAINERS:
+        tag, _, class_name = selector.partition('.')
+        if class_name and '.' not in class_name and ' ' not in tag:
+            _STRAINERS[selector] = SoupStrainer(tag, class_=class_name)
+        else:
+            _STRAINERS[selector] = None
+    return _STRAINERS[selector]
+
+def _parse_articles(content, selector):
+    """Parse HTML content and select the article nodes for a source."""
+    if LexborHTMLParser is not None:
+        return LexborHTMLParser(content).css(selector)
+    soup = BeautifulSoup(content, HTML_PARSER, parse_only=_strainer_for(selector))
+    return soup.select(selector)
+
 def extract_date(article):
     """Extract date from an article, handling both <span> and <time> tags."""
     date = None
+    if hasattr(article, 'css_first'):
+        date_span = article.css_first('span')
+        if date_span:
+            date = date_span.text(strip=True)
+        date_time = article.css_first('time')
+        if date_time:
+            date = date_time.attributes.get('datetime', None)
+        return date
     date_span = article.find('span')
     if date_span:
         date = date_span.get_text(strip=True)
@@ -47,43 +158,124 @@ def extract_date(article):
 
 def dynamic_extract(element, tag_names, attribute_name=None):
     """Dynamically extract content from an HTML element using a list of possible tags."""
+    is_lexbor = hasattr(element, 'css_first')
     for tag_name in tag_names:
-        target = element.find(tag_name)
-        if target:
-            if attribute_name and target.has_attr(attribute_name):
-                return target.get(attribute_name, '').strip()
-            return target.get_text(strip=True)
+        if is_lexbor:
+            target = element.css_first(tag_name)
+            if target:
+                if attribute_name:
+                    value = target.attributes.get(attribute_name)
+                    if value is not None:
+                        return value.strip()
+                else:
+                    return target.text(strip=True)
+        else:
+            target = element.find(tag_name)
+            if target:
+                if attribute_name and target.has_attr(attribute_name):
+                    return target.get(attribute_name, '').strip()
+                return target.get_text(strip=True)
     return ''
 
-def scrape_news(url, selector):
+_FIELD_TAGS = ['h2', 'h3', 'a', 'span', 'p', 'div', 'time']
+
+def _extract_fields(article):
+    """Collect title, link, description and date from an article.
+
+    Under BeautifulSoup each dynamic_extract/extract_date call walks the
+    subtree again; one find_all pass recording the first node per tag name
+    replaces up to six walks. Lexbor's C-side css_first is already cheap.
+    """
+    if hasattr(article, 'css_first'):
+        return (
+            dynamic_extract(article, ['h2', 'h3', 'a', 'span']),
+            dynamic_extract(article, ['a'], 'href'),
+            dynamic_extract(article, ['p', 'span', 'div']),
+            extract_date(article),
+        )
+
+    first = {}
+    for tag in article.find_all(_FIELD_TAGS):
+        if tag.name not in first:
+            first[tag.name] = tag
+            if len(first) == len(_FIELD_TAGS):
+                break
+
+    def first_text(tag_names):
+        for tag_name in tag_names:
+            target = first.get(tag_name)
+            if target:
+                return target.get_text(strip=True)
+        return ''
+
+    title = first_text(['h2', 'h3', 'a', 'span'])
+    anchor = first.get('a')
+    if anchor:
+        link = anchor.get('href', '').strip() if anchor.has_attr('href') else anchor.get_text(strip=True)
+    else:
+        link = ''
+    description = first_text(['p', 'span', 'div'])
+
+    date = None
+    date_span = first.get('span')
+    if date_span:
+        date = date_span.get_text(strip=True)
+    date_time = first.get('time')
+    if date_time:
+        date = date_time.get('datetime', None)
+
+    return title, link, description, date
+
+# Stop parsing a list page after this many consecutive already-sent links;
+# the lists are newest-first, so everything below is older still
+SEEN_STREAK_LIMIT = 3
+
+def scrape_news(url, selector, sent_ids=frozenset()):
     """Scrape news articles from a given URL and selector."""
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-        'Accept-Language': 'en-US,en;q=0.9',
-        'Accept-Encoding': 'gzip, deflate, br',
-        'Connection': 'keep-alive'
-    }
+    headers = {}
+    validators = _HTTP_CACHE.get(url, {})
+    if validators.get('etag'):
+        headers['If-None-Match'] = validators['etag']
+    if validators.get('last_modified'):
+        headers['If-Modified-Since'] = validators['last_modified']
 
     try:
-        response = requests.get(url, headers=headers)
+        response = SESSION.get(url, headers=headers, timeout=10)
+        if response.status_code == 304:
+            logging.info(f"No changes for {url} (HTTP 304); skipping parse.")
+            return []
         response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
 
-        articles = soup.select(selector)
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if etag or last_modified:
+            with _HTTP_CACHE_LOCK:
+                _HTTP_CACHE[url] = {'etag': etag, 'last_modified': last_modified}
+                _save_http_cache()
+
+        articles = _parse_articles(response.content, selector)
         items = []
 
+        # Local name skips the chained attribute lookup on every article
+        urljoin = requests.compat.urljoin
+
+        seen_streak = 0
         for article in articles:
-            title = dynamic_extract(article, ['h2', 'h3', 'a', 'span'])
-            link = dynamic_extract(article, ['a'], 'href')
-            description = dynamic_extract(article, ['p', 'span', 'div'])
+            title, link, description, date_str = _extract_fields(article)
 
             if not title:
                 title = description if description else 'No title'
 
             if link and not link.startswith('http'):
-                link = requests.compat.urljoin(url, link)
+                link = urljoin(url, link)
+
+            if link and normalize_url(link) in sent_ids:
+                seen_streak += 1
+                if seen_streak >= SEEN_STREAK_LIMIT:
+                    break
+                continue
+            seen_streak = 0
 
-            date_str = extract_date(article)
             pub_date = parse_date(date_str) if date_str else datetime.datetime.now()
 
             items.append({
@@ -99,111 +291,294 @@ def scrape_news(url, selector):
         logging.error(f"Error fetching data from {url}: {e}")
         return []
 
-def create_or_update_json_feed(items, output_file):
-    """Create or update a JSON feed with current date items."""
+def normalize_url(url):
+    """Strip fragment and query so tracking params don't defeat dedup.
+
+    A plain split keeps scheme/host/path byte-identical and avoids the full
+    urlparse/urlunparse round-trip.
+    """
+    return url.split('#', 1)[0].split('?', 1)[0]
+
+def iso_date(date_str, _cache={}):
+    """Date part of an ISO timestamp, memoized on the raw string.
+
+    Feed items repeat the same pubDate strings run after run; slicing to the
+    date prefix avoids building a full datetime for every comparison.
+    """
+    cached = _cache.get(date_str)
+    if cached is not None:
+        return cached
+    return _cache.setdefault(date_str, datetime.date.fromisoformat(date_str[:10]))
+
+def _jsonl_path(output_file):
+    """Path of the append-only JSONL sidecar backing a feed file."""
+    return os.path.join(script_directory, os.path.splitext(output_file)[0] + '.jsonl')
+
+def append_jsonl_items(items, output_file):
+    """Append new items to the feed's JSONL sidecar — O(new) per source."""
+    with open(_jsonl_path(output_file), 'ab') as file:
+        for item in items:
+            file.write(orjson.dumps(item) + b'\n')
+
+def rebuild_json_feed(output_file, today=None):
+    """Rebuild the summary JSON feed from the sidecar, keeping today's items."""
     output_path = os.path.join(script_directory, output_file)
-    today = datetime.datetime.now().date()
-
-    if os.path.exists(output_path):
-        with open(output_path, 'r', encoding='utf-8') as file:
+    jsonl_path = _jsonl_path(output_file)
+    if not os.path.exists(jsonl_path):
+        return
+    if today is None:
+        today = datetime.date.today()
+
+    items = []
+    with open(jsonl_path, 'rb') as file:
+        for line in file:
+            if not line.strip():
+                continue
             try:
-                existing_data = json.load(file)
-                existing_items = existing_data.get('items', [])
-                # Keep only items from today
-                existing_items = [item for item in existing_items if datetime.datetime.fromisoformat(item['pubDate']).date() == today]
-            except json.JSONDecodeError:
-                logging.warning(f"Failed to decode JSON from {output_path}. Creating a new feed.")
-                existing_items = []
-    else:
-        existing_items = []
-
-    # Add new items from today
-    new_items = [item for item in items if datetime.datetime.fromisoformat(item['pubDate']).date() == today]
-    updated_items = existing_items + new_items
+                item = orjson.loads(line)
+            except orjson.JSONDecodeError:
+                logging.warning(f"Skipping malformed line in {jsonl_path}.")
+                continue
+            if iso_date(item['pubDate']) == today:
+                items.append(item)
 
     feed_data = {
         'title': "RSS Feed Title",
         'link': "https://example.com",
         'description': "RSS Feed Description",
         'lastBuildDate': datetime.datetime.now().isoformat(),
-        'items': updated_items
+        'items': items
     }
 
     try:
-        logging.info(f"Creating/Updating JSON feed: {output_path} with {len(updated_items)} items.")
-        with open(output_path, 'w', encoding='utf-8') as file:
-            json.dump(feed_data, file, indent=4)
-            logging.info(f"JSON feed successfully written to {output_path}.")
+        logging.info(f"Rebuilding JSON feed: {output_path} with {len(items)} items.")
+        # Compact output: pretty-printing roughly doubles bytes written and
+        # nothing human reads these files
+        with open(output_path, 'wb') as file:
+            file.write(orjson.dumps(feed_data))
+
+        # Compact the sidecar down to today's items so it never grows unbounded
+        with open(jsonl_path, 'wb') as file:
+            for item in items:
+                file.write(orjson.dumps(item) + b'\n')
     except Exception as e:
         logging.error(f"Failed to write JSON feed to {output_path}: {e}")
 
+# Telegram rejects message texts longer than this
+TELEGRAM_MESSAGE_LIMIT = 4096
+
+# MarkdownV2 special characters, escaped in a single C-level translate pass
+_MD_SPECIALS = str.maketrans({c: '\\' + c for c in r'_*[]()~`>#+-=|{}.!'})
+
+def _batch_messages(messages, limit=TELEGRAM_MESSAGE_LIMIT):
+    """Coalesce messages into the fewest texts that fit Telegram's length cap."""
+    batches = []
+    current = ''
+    for message in messages:
+        candidate = message if not current else current + '\n\n' + message
+        if len(candidate) > limit and current:
+            batches.append(current)
+            current = message
+        else:
+            current = candidate
+    if current:
+        batches.append(current)
+    return batches
+
+class RateLimiter:
+    """Pace calls to a fixed interval instead of sleeping a flat delay per call.
+
+    Thread-safe: process_source runs on a pool, so concurrent senders must
+    agree on the next allowed slot.
+    """
+
+    def __init__(self, interval):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next_allowed = 0.0
+
+    def wait(self):
+        """Block until the next send slot, claiming it for this caller."""
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next_allowed - now
+            self._next_allowed = max(now, self._next_allowed) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+    def hold(self, seconds):
+        """Push the next slot out, e.g. after a 429 with Retry-After."""
+        with self._lock:
+            self._next_allowed = max(self._next_allowed, time.monotonic() + seconds)
+
+# Telegram allows well over 1 msg/s to a single chat; one second of spacing
+# stays comfortably inside the limit without serializing whole runs
+TELEGRAM_LIMITER = RateLimiter(1.0)
+
 def send_to_telegram(bot_token, chat_id, message):
     telegram_api_url = f'https://api.telegram.org/bot{bot_token}/sendMessage'
     payload = {
         'chat_id': chat_id,
         'text': message,
-        'parse_mode': 'Markdown'
+        'parse_mode': 'MarkdownV2'
     }
-    try:
-        response = requests.post(telegram_api_url, data=payload)
-        response.raise_for_status()
-    except requests.exceptions.HTTPError as http_err:
-        if response.status_code == 429:
-            logging.warning("Rate limit exceeded. Waiting before retrying...")
-            time.sleep(60)
-        else:
+    # Retry with exponential backoff instead of dropping the message; 429s
+    # push the shared limiter out by whatever Telegram asks for
+    for attempt in range(5):
+        TELEGRAM_LIMITER.wait()
+        try:
+            response = TELEGRAM_SESSION.post(telegram_api_url, data=payload, timeout=10)
+            if response.status_code == 429:
+                retry_after = int(response.headers.get('Retry-After', 2 ** attempt))
+                logging.warning(f"Rate limit exceeded. Backing off for {retry_after}s.")
+                TELEGRAM_LIMITER.hold(retry_after)
+                continue
+            response.raise_for_status()
+            return
+        except requests.exceptions.HTTPError as http_err:
             logging.error(f"HTTP error occurred: {http_err}")
-    except requests.exceptions.RequestException as e:
-        logging.error(f"Failed to send message to Telegram: {e}")
+            return
+        except requests.exceptions.RequestException as e:
+            logging.error(f"Failed to send message to Telegram: {e}")
+            return
+    logging.error("Giving up on Telegram message after repeated rate limiting.")
+
+# Sent-id sets memoized per path on file mtime; in steady state the file is
+# only touched by this process, so re-reading it every cycle is pure waste
+_SENT_IDS_CACHE = {}
+
+# Paths still holding the legacy JSON-array format; rewritten as a line log
+# on their first write so later runs only ever append
+_LEGACY_JSON_PATHS = set()
 
 def read_sent_ids(file_path):
     """Read the set of sent IDs from a file."""
     if os.path.exists(file_path):
-        with open(file_path, 'r', encoding='utf-8') as file:
+        mtime = os.stat(file_path).st_mtime
+        cached = _SENT_IDS_CACHE.get(file_path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        with open(file_path, 'rb') as file:
+            raw = file.read()
+        if raw.lstrip().startswith(b'['):
             try:
-                return set(json.load(file))
-            except json.JSONDecodeError:
+                ids = set(orjson.loads(raw))
+            except orjson.JSONDecodeError:
                 logging.warning(f"Failed to decode JSON from {file_path}. Returning empty set.")
+                # Still mark the path so the next write replaces the broken
+                # file wholesale instead of appending after the bad prefix
+                _LEGACY_JSON_PATHS.add(file_path)
                 return set()
+            _LEGACY_JSON_PATHS.add(file_path)
+        else:
+            ids = set(raw.decode('utf-8').splitlines())
+            ids.discard('')
+        _SENT_IDS_CACHE[file_path] = (mtime, ids)
+        return ids
     return set()
 
-def write_sent_ids(file_path, ids):
-    """Write a set of sent IDs to a file."""
-    with open(file_path, 'w', encoding='utf-8') as file:
-        json.dump(list(ids), file)
-
-def process_source(source, bot_token, chat_id):
+def write_sent_ids(file_path, new_ids):
+    """Append newly sent IDs to the log; O(#new) instead of a full rewrite."""
+    ids = read_sent_ids(file_path)
+    to_add = set(new_ids) - ids
+    if not to_add and file_path not in _LEGACY_JSON_PATHS:
+        return
+    # In-place update: O(new) and the cached set stays current without a copy
+    ids.update(to_add)
+    if file_path in _LEGACY_JSON_PATHS:
+        # One-time migration: rewrite the JSON array as newline-delimited ids
+        with open(file_path, 'w', encoding='utf-8') as file:
+            file.write('\n'.join(ids) + '\n')
+        _LEGACY_JSON_PATHS.discard(file_path)
+    else:
+        with open(file_path, 'a', encoding='utf-8') as file:
+            file.write('\n'.join(to_add) + '\n')
+    _SENT_IDS_CACHE[file_path] = (os.stat(file_path).st_mtime, ids)
+
+# Cross-source dedup for one run: the moneycontrol/business-standard lists
+# overlap, so a story accepted by one source shouldn't re-alert from another.
+# TITLE_SEEN catches near-duplicates whose links differ but titles match.
+_SEEN_LOCK = threading.Lock()
+SEEN = set()
+TITLE_SEEN = set()
+
+def _title_fingerprint(title):
+    """Short stable hash of the title prefix for near-duplicate detection."""
+    return hashlib.blake2b(title[:80].lower().encode('utf-8'), digest_size=8).digest()
+
+# Write-behind buffers: process_source only touches memory, and main() flushes
+# each file exactly once after all sources finish
+_PENDING_LOCK = threading.Lock()
+PENDING_FEEDS = {}
+PENDING_IDS = {}
+
+def flush_pending_writes(today=None):
+    """Write buffered feed updates and sent IDs, one pass per file."""
+    with _PENDING_LOCK:
+        feeds, ids = dict(PENDING_FEEDS), dict(PENDING_IDS)
+        PENDING_FEEDS.clear()
+        PENDING_IDS.clear()
+    for output_file, items in feeds.items():
+        append_jsonl_items(items, output_file)
+        rebuild_json_feed(output_file, today)
+        logging.info(f"JSON feed created/updated successfully: {output_file}")
+    for file_path, new_ids in ids.items():
+        write_sent_ids(file_path, new_ids)
+        logging.info(f"Sent alerts updated in {file_path}")
+
+# Persist buffered state even when the run is cut short: atexit covers normal
+# interpreter exit, and SIGTERM (how CI kills jobs) is rerouted through it
+atexit.register(flush_pending_writes)
+
+def _handle_sigterm(signum, frame):
+    raise SystemExit(0)
+
+signal.signal(signal.SIGTERM, _handle_sigterm)
+
+def process_source(source, bot_token, chat_id, today=None):
     """Process a news source by scraping data, sending messages, and updating sent IDs."""
-    # Keywords to exclude
-    exclude_keywords = ["KR Choksey", "Lilladher","motilal","ICICI Securities","Sharekhan","straight session","Anand Rathi","Emkay"]
-
-    sent_ids_file_path = os.path.join(script_directory, source['sent_ids_file'])
+    sent_ids_file_path = source['sent_ids_path']
     sent_ids = read_sent_ids(sent_ids_file_path)
-    items = scrape_news(source['url'], source['selector'])
+    items = scrape_news(source['url'], source['selector'], sent_ids)
     
     if items:
-        today = datetime.datetime.now().date()
-        new_items = [item for item in items if datetime.datetime.fromisoformat(item['pubDate']).date() == today]
-        
-        # Filter out items that contain any excluded keywords in the title or description
-        filtered_items = []
-        for item in new_items:
-            if not any(keyword.lower() in (item['title'] + " " + item['description']).lower() for keyword in exclude_keywords):
-                filtered_items.append(item)
-        
-        new_items_to_send = [item for item in filtered_items if item['link'] not in sent_ids]
-        
-        if new_items_to_send:
-            for item in new_items_to_send:
-                message = f"*{item['title']}*\n\n{item['description']}"
-                send_to_telegram(bot_token, chat_id, message)
+        if today is None:
+            today = datetime.date.today()
+
+        # One pass: date filter, keyword filter, and sent-ids check together,
+        # touching each item's link exactly once
+        new_items_to_send = []
+        new_ids = set()
+        for item in items:
+            if iso_date(item['pubDate']) != today:
+                continue
+            if EXCLUDE_RE.search(item['title']) or EXCLUDE_RE.search(item['description']):
+                continue
+            link = normalize_url(item['link']) or item['link']
+            if link in sent_ids:
+                continue
+            fingerprint = _title_fingerprint(item['title'])
+            with _SEEN_LOCK:
+                if link in SEEN or fingerprint in TITLE_SEEN:
+                    continue
+                SEEN.add(link)
+                TITLE_SEEN.add(fingerprint)
+            new_items_to_send.append(item)
+            new_ids.add(link)
 
-            create_or_update_json_feed(new_items_to_send, source['output_file'])
-            logging.info(f"JSON feed created/updated successfully: {source['output_file']}")
-
-            new_ids = set(item['link'] for item in new_items_to_send)
-            write_sent_ids(sent_ids_file_path, sent_ids.union(new_ids))
-            logging.info(f"Sent alerts updated in {sent_ids_file_path}")
+        if new_items_to_send:
+            # One POST per batch of items instead of one per item; escape once
+            # so Telegram never rejects a batch over stray Markdown characters
+            messages = [
+                f"*{item['title'].translate(_MD_SPECIALS)}*\n\n{item['description'].translate(_MD_SPECIALS)}"
+                for item in new_items_to_send
+            ]
+            for batch in _batch_messages(messages):
+                send_to_telegram(bot_token, chat_id, batch)
+
+            with _PENDING_LOCK:
+                PENDING_FEEDS.setdefault(source['output_file'], []).extend(new_items_to_send)
+                PENDING_IDS.setdefault(sent_ids_file_path, set()).update(new_ids)
 
 def main():
     bot_token = os.environ.get('TELEGRAM_BOT_TOKEN')
@@ -213,61 +588,29 @@ def main():
         logging.error("Telegram bot token or chat ID is not set. Exiting.")
         return
 
+    # Shared source list lives in config.py; resolve each sent-ids path once
+    # per run instead of re-joining it in every helper
     sources = [
-        {
-            'url': "https://www.moneycontrol.com/news/business/stocks/",
-            'selector': 'li.clearfix',
-            'output_file': "moneycontrol_rss_feed.json",
-            'sent_ids_file': 'moneycontrol_sent_ids.json'
-        },
-         {
-            'url': "https://www.moneycontrol.com/news/business/companies/",
-            'selector': 'li.clearfix',
-            'output_file': "moneycontrol_companies_rss_feed.json",
-            'sent_ids_file': 'moneycontrol__companies_sent_ids.json'
-        },
-        {
-            'url': "https://economictimes.indiatimes.com/markets/stocks/earnings/news",
-            'selector': 'div.eachStory',
-            'output_file': "economictimes_earnings_rss_feed.json",
-            'sent_ids_file': 'economictimes_earnings_sent_ids.json'
-        },
-        {
-            'url': "https://economictimes.indiatimes.com/markets/stocks/news",
-            'selector': 'div.eachStory',
-            'output_file': "economictimes_stocks_rss_feed.json",
-            'sent_ids_file': 'economictimes_stocks_sent_ids.json'
-        },
-        {
-            'url': "https://www.business-standard.com/markets/news",
-            'selector': 'div.listingstyle_cardlistlist__dfq57.cardlist',
-            'output_file': "businessstandard_markets_news_rss_feed.json",
-            'sent_ids_file': 'businessstandard_markets_news_sent_ids.json'
-        },
-        {
-            'url': "https://www.business-standard.com/markets/capital-market-news",
-            'selector': 'div.listingstyle_cardlistlist__dfq57.cardlist',
-            'output_file': "businessstandard_capital_market_news_rss_feed.json",
-            'sent_ids_file': 'businessstandard_capital_market_news_sent_ids.json'
-        },
-        {
-            'url': "https://www.business-standard.com/topic/ipos",
-            'selector': 'div.listingstyle_cardlistlist__dfq57.cardlist',
-            'output_file': "businessstandard_ipos_rss_feed.json",
-            'sent_ids_file': 'businessstandard_ipos_sent_ids.json'
-        },
-        {
-            'url': "https://www.business-standard.com/markets/mutual-fund",
-            'selector': 'div.listingstyle_cardlistlist__dfq57.cardlist',
-            'output_file': "businessstandard_mutual_fund_rss_feed.json",
-            'sent_ids_file': 'businessstandard_mutual_fund_sent_ids.json'
-        }
+        dict(source, sent_ids_path=os.path.join(script_directory, source['sent_ids_file']))
+        for source in SOURCES
     ]
 
     logging.info("Starting news scraping process...")
-    random.shuffle(sources)
+    # One date for the whole run; every filter compares against the same day
+    today = datetime.date.today()
+
+    # Seed the cross-source dedup set with everything any source has sent
     for source in sources:
-        process_source(source, bot_token, chat_id)
+        SEEN.update(read_sent_ids(source['sent_ids_path']))
+
+    random.shuffle(sources)
+    # Sources are independent (own sent-ids file, own feed file), so fetch
+    # them in parallel; total wall time collapses to roughly the slowest site
+    with ThreadPoolExecutor(max_workers=min(8, len(sources))) as executor:
+        futures = [executor.submit(process_source, source, bot_token, chat_id, today) for source in sources]
+        for future in futures:
+            future.result()
+    flush_pending_writes(today)
     logging.info("Scraping process completed.")
 
 if __name__ == "__main__":
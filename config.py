@@ -0,0 +1,57 @@
+"""Shared scrape-source configuration for the MarketAlert scripts.
+
+MarketAlert_NL.py and MarketAlert_New_Ex.py poll the same sources; keeping
+the list in one place stops the two copies from drifting apart and makes it
+obvious they should not both be deployed against the same chat.
+"""
+
+SOURCES = [
+    {
+        'url': "https://www.moneycontrol.com/news/business/stocks/",
+        'selector': 'li.clearfix',
+        'output_file': "moneycontrol_rss_feed.json",
+        'sent_ids_file': 'moneycontrol_sent_ids.json'
+    },
+    {
+        'url': "https://www.moneycontrol.com/news/business/companies/",
+        'selector': 'li.clearfix',
+        'output_file': "moneycontrol_companies_rss_feed.json",
+        'sent_ids_file': 'moneycontrol__companies_sent_ids.json'
+    },
+    {
+        'url': "https://economictimes.indiatimes.com/markets/stocks/earnings/news",
+        'selector': 'div.eachStory',
+        'output_file': "economictimes_earnings_rss_feed.json",
+        'sent_ids_file': 'economictimes_earnings_sent_ids.json'
+    },
+    {
+        'url': "https://economictimes.indiatimes.com/markets/stocks/news",
+        'selector': 'div.eachStory',
+        'output_file': "economictimes_stocks_rss_feed.json",
+        'sent_ids_file': 'economictimes_stocks_sent_ids.json'
+    },
+    {
+        'url': "https://www.business-standard.com/markets/news",
+        'selector': 'div.listingstyle_cardlistlist__dfq57.cardlist',
+        'output_file': "businessstandard_markets_news_rss_feed.json",
+        'sent_ids_file': 'businessstandard_markets_news_sent_ids.json'
+    },
+    {
+        'url': "https://www.business-standard.com/markets/capital-market-news",
+        'selector': 'div.listingstyle_cardlistlist__dfq57.cardlist',
+        'output_file': "businessstandard_capital_market_news_rss_feed.json",
+        'sent_ids_file': 'businessstandard_capital_market_news_sent_ids.json'
+    },
+    {
+        'url': "https://www.business-standard.com/topic/ipos",
+        'selector': 'div.listingstyle_cardlistlist__dfq57.cardlist',
+        'output_file': "businessstandard_ipos_rss_feed.json",
+        'sent_ids_file': 'businessstandard_ipos_sent_ids.json'
+    },
+    {
+        'url': "https://www.business-standard.com/markets/mutual-fund",
+        'selector': 'div.listingstyle_cardlistlist__dfq57.cardlist',
+        'output_file': "businessstandard_mutual_fund_rss_feed.json",
+        'sent_ids_file': 'businessstandard_mutual_fund_sent_ids.json'
+    }
+]